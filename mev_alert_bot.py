@@ -6,42 +6,101 @@ Monitors Solana wallets and sends alerts when non-MEV-protected transactions are
 
 import asyncio
 import os
+import re
 import traceback
-from datetime import datetime
-from typing import Dict, Set, Optional
+import weakref
+from collections import deque
+from functools import partial
+from urllib.parse import urlparse
+from datetime import timedelta
+from typing import Deque, Dict, List, Set, Tuple, Optional
 from dotenv import load_dotenv
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, RetryAfter
 from telegram.ext import (
     Application,
     CommandHandler,
     CallbackQueryHandler,
-    MessageHandler,
-    ContextTypes,
-    filters
+    ContextTypes
 )
 
-from mev_protection_checker import MEVProtectionChecker, TransactionStatus
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Confirmed
+
+from mev_protection_checker import MAX_CONCURRENT_LOOKUPS, MEVProtectionChecker, is_rate_limit_error
 
 # Load environment variables
 load_dotenv()
 
+# Monitoring configuration, read once at startup
+SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+SOLANA_WS_URL = os.getenv("SOLANA_WS_URL")  # Optional, enables push notifications
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "2.0"))  # Default 2 seconds
+
+# Solana addresses are 32-44 base58 characters (no 0, O, I or l)
+BASE58_ADDRESS_RE = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+
+# Signatures remembered per wallet for de-duplication. Only the newest few
+# are re-fetched each poll, so a bounded window keeps memory flat
+MAX_SEEN_SIGNATURES = 1000
+
+# Push mode: reconnect backoff after a dropped WebSocket, and how many failed
+# reconnects in a row before a monitor gives up and polls instead
+WS_RECONNECT_BACKOFF_MAX = 60.0  # seconds
+WS_MAX_RECONNECT_ATTEMPTS = 5
+
 # Bot state
 tracked_wallets: Dict[str, str] = {}  # {address: name}
 monitoring_tasks: Dict[str, asyncio.Task] = {}  # {address: task}
+
+# Outbound alerts: (chat_id, message, parse_mode), drained by alert_sender_loop
+alert_queue: asyncio.Queue = asyncio.Queue()
+alert_sender_task: Optional[asyncio.Task] = None
+
+# Alerts queued within this window are merged into as few messages as possible
+ALERT_COALESCE_WINDOW = 0.1  # seconds
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Spacing between outbound sends, keeping us under Telegram's ~30 messages/s limit
+ALERT_SEND_INTERVAL = 1 / 25  # seconds
+alert_next_send = 0.0  # Event loop time before which deliver_alert won't send
+
+# How long shutdown waits for queued alerts to go out before dropping them
+ALERT_FLUSH_TIMEOUT = 5.0  # seconds
 bot_application = None
 
+# Only the update kinds we have handlers for (commands and button presses); anything
+# else would just be downloaded, decoded and dropped
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+rpc_client: Optional[AsyncClient] = None  # Shared by all monitors, see get_rpc_client()
+# Bounds transaction lookups across all monitors, since they share one client and its rate limit
+rpc_lookup_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+# Updates are handled concurrently; this keeps button presses ordered within a chat.
+# Weak values: a chat's lock is dropped as soon as no handler holds it
+chat_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
 
 class WalletMonitor:
     """Monitors a single wallet and sends alerts"""
 
-    def __init__(self, address: str, name: str, rpc_url: str, chat_id: int, poll_interval: float = 2.0):
+    __slots__ = (
+        'address', 'short_address', 'name', 'rpc_url', 'ws_url', 'chat_id', 'poll_interval', 'seen_signatures',
+        'seen_order', 'is_running', 'checker', 'rate_limit_backoff', 'consecutive_errors', 'check_count',
+    )
+
+    def __init__(self, address: str, name: str, rpc_url: str, chat_id: int, poll_interval: float = 2.0,
+                 ws_url: Optional[str] = None):
         self.address = address
+        self.short_address = f"{address[:16]}..."  # Abbreviated form used in every alert
         self.name = name
         self.rpc_url = rpc_url
+        self.ws_url = ws_url  # If set, receive transactions by subscription instead of polling
         self.chat_id = chat_id
         self.poll_interval = poll_interval  # Base polling interval
         self.seen_signatures: Set[str] = set()
+        self.seen_order: Deque[str] = deque(maxlen=MAX_SEEN_SIGNATURES)  # Oldest first, for eviction
         self.is_running = True
         self.checker: Optional[MEVProtectionChecker] = None
         self.rate_limit_backoff = 1.0  # Initial backoff in seconds
@@ -53,20 +112,26 @@ class WalletMonitor:
         print(f"🔍 Started monitoring {self.name} ({self.address[:8]}...)")
 
         try:
-            # Create checker in the monitoring task's async context
-            self.checker = MEVProtectionChecker(rpc_url=self.rpc_url)
-            await self.checker.connect()
+            # Create checker in the monitoring task's async context, on the shared RPC connection pool
+            self.checker = MEVProtectionChecker(
+                rpc_url=self.rpc_url,
+                client=get_rpc_client(self.rpc_url),
+                lookup_semaphore=rpc_lookup_semaphore
+            )
 
-            # Validate address
-            pubkey = await self.checker.validate_address(self.address)
+            # Connect and validate address concurrently - both are independent RPC round-trips
+            _, pubkey = await asyncio.gather(
+                self.checker.connect(),
+                self.checker.validate_address(self.address)
+            )
             if not pubkey:
-                await self.send_alert(f"❌ Invalid address for wallet: {self.name}")
+                self.send_alert(f"❌ Invalid address for wallet: {self.name}")
                 return
 
             self.checker.monitored_address = pubkey
 
             # Send start notification
-            await self.send_alert(
+            self.send_alert(
                 f"✅ Started monitoring wallet:\n"
                 f"📛 Name: {self.name}\n"
                 f"📍 Address: `{self.address}`\n\n"
@@ -74,6 +139,15 @@ class WalletMonitor:
                 parse_mode='Markdown'
             )
 
+            # Prefer push notifications; fall back to polling if we can't (re)subscribe
+            if self.ws_url:
+                try:
+                    await self.watch_transactions()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠ WebSocket subscription failed for {self.name}: {e}. Falling back to polling")
+
             # Start monitoring loop
             while self.is_running:
                 self.check_count += 1
@@ -95,10 +169,89 @@ class WalletMonitor:
         except Exception as e:
             print(f"❌ Error monitoring {self.name}: {e}")
             traceback.print_exc()
-            await self.send_alert(f"❌ Error monitoring {self.name}: {e}")
+            self.send_alert(f"❌ Error monitoring {self.name}: {e}")
             if self.checker:
                 await self.checker.close()
 
+    async def watch_transactions(self):
+        """
+        Receive new transactions via a logsSubscribe WebSocket instead of polling.
+
+        A dropped or server-closed connection is re-established with backoff, with a
+        catch-up poll for anything missed in between. Raises (so the caller polls
+        instead) if the first subscription fails or reconnecting keeps failing.
+        """
+        # Imported here so a missing or changed websocket API only disables push mode
+        # (start_monitoring falls back to polling) instead of breaking the whole bot
+        from solana.rpc.websocket_api import connect as ws_connect
+        from solders.rpc.config import RpcTransactionLogsFilterMentions
+
+        subscribed_once = False
+        failed_reconnects = 0
+        reconnect_delay = 1.0
+
+        while self.is_running:
+            try:
+                async with ws_connect(self.ws_url) as websocket:
+                    await websocket.logs_subscribe(
+                        RpcTransactionLogsFilterMentions(self.checker.monitored_address),
+                        commitment=Confirmed
+                    )
+                    await websocket.recv()  # Subscription confirmation
+                    print(f"📡 {self.name}: Subscribed to transaction logs")
+
+                    if subscribed_once:
+                        await self.check_transactions()  # Catch up on the disconnected gap
+                    subscribed_once = True
+                    failed_reconnects = 0
+                    reconnect_delay = 1.0
+
+                    async for messages in websocket:
+                        new_sigs = []
+                        for message in messages:
+                            logs = message.result.value
+                            sig_str = str(logs.signature)
+
+                            # Skip already processed or failed transactions
+                            if sig_str in self.seen_signatures or logs.err is not None:
+                                continue
+
+                            new_sigs.append((sig_str, message.result.context.slot))
+
+                        await self.process_pushed_signatures(new_sigs)
+
+                        if not self.is_running:
+                            return
+
+                print(f"⚠ {self.name}: WebSocket closed by server, reconnecting in {reconnect_delay}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not subscribed_once:
+                    raise
+                failed_reconnects += 1
+                if failed_reconnects > WS_MAX_RECONNECT_ATTEMPTS:
+                    raise
+                print(f"⚠ {self.name}: WebSocket error ({e}), reconnecting in {reconnect_delay}s")
+
+            await asyncio.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, WS_RECONNECT_BACKOFF_MAX)
+
+    async def process_pushed_signatures(self, new_sigs: List[Tuple[str, int]]):
+        """Process pushed signatures, retrying the batch with backoff while rate limited"""
+        while True:
+            try:
+                # Pushed at Confirmed, so look them up at Confirmed too (not yet finalized)
+                await self.process_new_signatures(new_sigs, commitment=Confirmed)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.record_rate_limit()
+                await asyncio.sleep(self.rate_limit_backoff)
+            else:
+                self.reset_backoff()
+                return
+
     async def check_transactions(self):
         """Check for new transactions"""
         try:
@@ -110,14 +263,13 @@ class WalletMonitor:
 
             if not response.value:
                 # Reset backoff on successful request
-                self.rate_limit_backoff = 1.0
-                self.consecutive_errors = 0
+                self.reset_backoff()
                 # Log every 20 checks when no transactions found
                 if self.check_count % 20 == 0:
                     print(f"✓ {self.name}: Checked {self.check_count} times, monitoring active...")
                 return
 
-            new_tx_count = 0
+            new_sigs = []
             for sig_info in response.value:
                 sig_str = str(sig_info.signature)
 
@@ -129,51 +281,80 @@ class WalletMonitor:
                 if sig_info.block_time is None:
                     continue
 
-                self.seen_signatures.add(sig_str)
-                new_tx_count += 1
+                new_sigs.append((sig_str, sig_info.slot))
 
-                # Check if it's a Jito transaction
-                is_mev_protected = await self.checker._check_if_jito_transaction(sig_str)
-
-                # Send alert if NOT MEV protected
-                if not is_mev_protected:
-                    print(f"🚨 {self.name}: Non-MEV transaction detected! Sending alert...")
-                    await self.send_non_mev_alert(sig_str, sig_info.slot)
-                else:
-                    print(f"🔒 {self.name}: MEV-protected transaction detected (no alert)")
+            new_tx_count = len(new_sigs)
+            await self.process_new_signatures(new_sigs)
 
             # Log when new transactions are found
             if new_tx_count > 0 and self.check_count > 1:  # Skip first check
                 print(f"📊 {self.name}: Found {new_tx_count} new transaction(s)")
 
             # Reset backoff on successful request
-            self.rate_limit_backoff = 1.0
-            self.consecutive_errors = 0
+            self.reset_backoff()
 
         except Exception as e:
-            error_str = str(e)
-
             # Check if it's a rate limit error (429)
-            if "429" in error_str or "Too Many Requests" in error_str:
-                self.consecutive_errors += 1
-                # Exponential backoff: 5s, 10s, 20s, 40s, max 60s
-                self.rate_limit_backoff = min(5.0 * (2 ** (self.consecutive_errors - 1)), 60.0)
-
-                if self.consecutive_errors == 1:
-                    print(f"⚠ Rate limit hit for {self.name}. Backing off to {self.rate_limit_backoff}s intervals")
-                elif self.consecutive_errors % 5 == 0:
-                    print(f"⚠ Still rate limited for {self.name} (backoff: {self.rate_limit_backoff}s)")
+            if is_rate_limit_error(e):
+                self.record_rate_limit()
             else:
                 # For non-rate-limit errors, print the full error
                 print(f"⚠ Error checking transactions for {self.name}: {type(e).__name__}: {e}")
                 traceback.print_exc()
 
-    async def send_non_mev_alert(self, signature: str, slot: int):
+    async def process_new_signatures(self, new_sigs: List[Tuple[str, int]],
+                                     commitment: Optional[Commitment] = None):
+        """
+        Classify new (signature, slot) pairs and alert on non-MEV-protected ones.
+
+        Signatures are only marked as seen once classified, so if a lookup is rate
+        limited the error propagates and the whole batch is retried next time.
+        """
+        # Check which are Jito transactions, fetching all new transactions concurrently
+        jito_results = await self.checker.check_jito_transactions(
+            [sig_str for sig_str, _ in new_sigs],
+            commitment=commitment
+        )
+
+        for (sig_str, slot), is_mev_protected in zip(new_sigs, jito_results):
+            self.remember_signature(sig_str)
+
+            # Send alert if NOT MEV protected
+            if not is_mev_protected:
+                print(f"🚨 {self.name}: Non-MEV transaction detected! Sending alert...")
+                self.send_non_mev_alert(sig_str, slot)
+            else:
+                print(f"🔒 {self.name}: MEV-protected transaction detected (no alert)")
+
+    def record_rate_limit(self):
+        """Grow the rate-limit backoff after a 429"""
+        self.consecutive_errors += 1
+        # Exponential backoff: 5s, 10s, 20s, 40s, max 60s
+        self.rate_limit_backoff = min(5.0 * (2 ** (self.consecutive_errors - 1)), 60.0)
+
+        if self.consecutive_errors == 1:
+            print(f"⚠ Rate limit hit for {self.name}. Backing off to {self.rate_limit_backoff}s intervals")
+        elif self.consecutive_errors % 5 == 0:
+            print(f"⚠ Still rate limited for {self.name} (backoff: {self.rate_limit_backoff}s)")
+
+    def reset_backoff(self):
+        """Clear the rate-limit backoff after a successful request"""
+        self.rate_limit_backoff = 1.0
+        self.consecutive_errors = 0
+
+    def remember_signature(self, signature: str):
+        """Mark a signature as seen, forgetting the oldest once the window is full"""
+        if len(self.seen_order) == self.seen_order.maxlen:
+            self.seen_signatures.discard(self.seen_order[0])
+        self.seen_order.append(signature)
+        self.seen_signatures.add(signature)
+
+    def send_non_mev_alert(self, signature: str, slot: int):
         """Send alert for non-MEV-protected transaction"""
         message = (
             f"🚨 NON-MEV-PROTECTED TRANSACTION DETECTED!\n\n"
             f"📛 Wallet: {self.name}\n"
-            f"📍 Address: `{self.address[:16]}...`\n"
+            f"📍 Address: `{self.short_address}`\n"
             f"📝 Signature: `{signature[:16]}...`\n"
             f"🔢 Slot: {slot}\n"
             f"⚠ Status: Public mempool transaction\n\n"
@@ -181,88 +362,270 @@ class WalletMonitor:
             f"🔗 [View on SolanaFM](https://solana.fm/tx/{signature})"
         )
 
-        await self.send_alert(message, parse_mode='Markdown')
+        self.send_alert(message, parse_mode='Markdown')
 
-    async def send_alert(self, message: str, parse_mode: str = None):
-        """Send alert to Telegram"""
-        try:
-            await bot_application.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=parse_mode,
-                disable_web_page_preview=True
-            )
-        except Exception as e:
-            print(f"❌ Failed to send alert: {e}")
+    def send_alert(self, message: str, parse_mode: str = None):
+        """Queue alert for delivery to Telegram (returns immediately)"""
+        queue_alert(self.chat_id, message, parse_mode)
 
     def stop(self):
         """Stop monitoring"""
         self.is_running = False
 
 
+def get_rpc_client(rpc_url: str) -> AsyncClient:
+    """
+    Return the RPC client shared by all wallet monitors, creating it on first use.
+
+    One client means one HTTP connection pool, so monitors reuse warm keep-alive
+    connections instead of each paying its own TCP/TLS handshakes.
+    """
+    global rpc_client
+
+    if rpc_client is None:
+        rpc_client = AsyncClient(rpc_url)
+    return rpc_client
+
+
+async def close_rpc_client(application: Application):
+    """Close the shared RPC client on shutdown"""
+    if rpc_client is not None:
+        await rpc_client.close()
+
+
+async def stop_alert_sender(application: Application):
+    """Flush queued alerts (up to ALERT_FLUSH_TIMEOUT) and stop the sender task on shutdown"""
+    if alert_sender_task is None:
+        return
+
+    try:
+        if not alert_sender_task.done():
+            await asyncio.wait_for(alert_queue.join(), ALERT_FLUSH_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+    if not alert_queue.empty():
+        print(f"⚠️  Dropping {alert_queue.qsize()} undelivered alert(s) on shutdown")
+
+    alert_sender_task.cancel()
+    await asyncio.gather(alert_sender_task, return_exceptions=True)
+
+
+def queue_alert(chat_id: int, message: str, parse_mode: Optional[str] = None):
+    """Queue an alert and make sure the sender task is running"""
+    global alert_sender_task
+
+    alert_queue.put_nowait((chat_id, message, parse_mode))
+    if alert_sender_task is None or alert_sender_task.done():
+        alert_sender_task = asyncio.create_task(alert_sender_loop())
+
+
+async def alert_sender_loop():
+    """
+    Drain the alert queue, coalescing bursts into as few Telegram messages as possible.
+
+    Alerts arriving within ALERT_COALESCE_WINDOW are grouped per chat. Consecutive
+    alerts with the same parse mode are joined (up to Telegram's message length
+    limit), so a burst of N alerts costs a handful of requests instead of N.
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = [await alert_queue.get()]
+
+        # Collect anything else that arrives within the window
+        deadline = loop.time() + ALERT_COALESCE_WINDOW
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                batch.append(await asyncio.wait_for(alert_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Merge per chat, preserving order: {chat_id: [[parse_mode, messages, merged_length], ...]}
+        merged: Dict[int, List[List]] = {}
+        for chat_id, message, parse_mode in batch:
+            chunks = merged.setdefault(chat_id, [])
+            if (chunks and chunks[-1][0] == parse_mode
+                    and chunks[-1][2] + 2 + len(message) <= TELEGRAM_MAX_MESSAGE_LENGTH):
+                chunks[-1][1].append(message)
+                chunks[-1][2] += 2 + len(message)
+            else:
+                chunks.append([parse_mode, [message], len(message)])
+
+        try:
+            for chat_id, chunks in merged.items():
+                for parse_mode, messages, _ in chunks:
+                    await deliver_merged_alerts(chat_id, messages, parse_mode)
+        finally:
+            # Lets stop_alert_sender() wait for delivery with alert_queue.join()
+            for _ in batch:
+                alert_queue.task_done()
+
+
+async def deliver_merged_alerts(chat_id: int, messages: List[str], parse_mode: Optional[str] = None):
+    """
+    Send alerts joined into one message, falling back to one message each if it's rejected.
+
+    Telegram rejects a whole message over a single bad entity (e.g. a wallet name
+    that breaks the Markdown), so retrying separately loses only the bad alert.
+    """
+    try:
+        await deliver_alert(chat_id, "\n\n".join(messages), parse_mode)
+        return
+    except BadRequest as e:
+        if len(messages) == 1:
+            print(f"❌ Failed to send alert: {e}")
+            return
+        print(f"⚠️  Merged alert rejected ({e}), sending {len(messages)} alerts separately")
+
+    for message in messages:
+        try:
+            await deliver_alert(chat_id, message, parse_mode)
+        except BadRequest as e:
+            print(f"❌ Failed to send alert: {e}")
+
+
+async def deliver_alert(chat_id: int, message: str, parse_mode: Optional[str] = None):
+    """
+    Send a message to Telegram, spaced by ALERT_SEND_INTERVAL and waiting out a
+    flood-control response once. BadRequest (the message itself was rejected) is raised.
+    """
+    global alert_next_send
+
+    loop = asyncio.get_running_loop()
+    delay = alert_next_send - loop.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    try:
+        for attempt in range(2):
+            try:
+                await bot_application.bot.send_message(
+                    chat_id=chat_id,
+                    text=message,
+                    parse_mode=parse_mode,
+                    disable_web_page_preview=True
+                )
+                return
+            except RetryAfter as e:
+                if attempt:
+                    print(f"❌ Failed to send alert: {e}")
+                    return
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                print(f"⚠️  Telegram rate limit hit, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+            except BadRequest:
+                raise
+            except Exception as e:
+                print(f"❌ Failed to send alert: {e}")
+                return
+    finally:
+        alert_next_send = loop.time() + ALERT_SEND_INTERVAL
+
+
+# Static keyboards, built once (markups are immutable, so one instance is shared by all chats)
+MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Wallet", callback_data="add_wallet")],
+    [InlineKeyboardButton("📋 List Wallets", callback_data="list_wallets")],
+    [InlineKeyboardButton("🗑️ Remove Wallet", callback_data="remove_wallet")],
+    [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
+])
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⬅️ Back to Menu", callback_data="back_to_menu")]
+])
+
+# Static message texts (Markdown)
+WELCOME_TEXT = (
+    "🤖 *MEV Alert Bot*\n\n"
+    "I monitor Solana wallets and alert you when they make "
+    "*non-MEV-protected* transactions.\n\n"
+    "What would you like to do?"
+)
+MAIN_MENU_TEXT = "🤖 *MEV Alert Bot*\n\nWhat would you like to do?"
+ADD_WALLET_USAGE_TEXT = (
+    "📝 To add a wallet, use this command:\n\n"
+    "`/add <address> <name>`\n\n"
+    "Example:\n"
+    "`/add DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK MyTrader`"
+)
+REMOVE_WALLET_USAGE_TEXT = (
+    "🗑️ To remove a wallet, use this command:\n\n"
+    "`/remove <address>`\n\n"
+    "Example:\n"
+    "`/remove DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK`\n\n"
+    "Or use `/list` to see all addresses."
+)
+HELP_TEXT = (
+    "*MEV Alert Bot - Help*\n\n"
+    "*Commands:*\n"
+    "/start - Show main menu\n"
+    "/add <address> <name> - Add wallet to track\n"
+    "/remove <address> - Remove wallet\n"
+    "/list - List all tracked wallets\n"
+    "/help - Show this help\n\n"
+    "*What does this bot do?*\n"
+    "Monitors Solana wallets and sends you alerts when they make "
+    "transactions WITHOUT MEV protection (Jito).\n\n"
+    "*Why is this useful?*\n"
+    "MEV-protected transactions are more secure and prevent frontrunning. "
+    "If a wallet you're tracking stops using MEV protection, you'll know immediately.\n\n"
+    "*Example:*\n"
+    "`/add DYw8...NSKK TopTrader`"
+)
+
+
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command"""
-    keyboard = [
-        [InlineKeyboardButton("➕ Add Wallet", callback_data="add_wallet")],
-        [InlineKeyboardButton("📋 List Wallets", callback_data="list_wallets")],
-        [InlineKeyboardButton("🗑️ Remove Wallet", callback_data="remove_wallet")],
-        [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    welcome_text = (
-        "🤖 *MEV Alert Bot*\n\n"
-        "I monitor Solana wallets and alert you when they make "
-        "*non-MEV-protected* transactions.\n\n"
-        "What would you like to do?"
-    )
-
-    await update.message.reply_text(welcome_text, reply_markup=reply_markup, parse_mode='Markdown')
+    await update.message.reply_text(WELCOME_TEXT, reply_markup=MAIN_MENU_MARKUP, parse_mode='Markdown')
 
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle button presses"""
+    lock = chat_locks.get(update.effective_chat.id)
+    if lock is None:
+        lock = chat_locks[update.effective_chat.id] = asyncio.Lock()
+
+    async with lock:
+        await handle_button(update, context)
+
+
+async def handle_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Dispatch a button press (called with the chat's lock held)"""
     query = update.callback_query
-    await query.answer()
-
-    if query.data == "add_wallet":
-        await query.edit_message_text(
-            "📝 To add a wallet, use this command:\n\n"
-            "`/add <address> <name>`\n\n"
-            "Example:\n"
-            "`/add DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK MyTrader`",
-            parse_mode='Markdown'
-        )
+    # Acknowledge in the background so the ack and the edit round-trips overlap
+    ack = asyncio.create_task(query.answer())
 
-    elif query.data == "list_wallets":
-        await list_wallets_command(update, context, is_callback=True)
+    try:
+        handler = BUTTON_HANDLERS.get(query.data)
+        if handler is not None:
+            await handler(update, context)
+    except BadRequest as e:
+        # A double tap re-renders the view already shown, and Telegram rejects an
+        # edit with identical text and markup; nothing needs changing then
+        if "Message is not modified" not in str(e):
+            raise
+    finally:
+        await ack
 
-    elif query.data == "remove_wallet":
-        await query.edit_message_text(
-            "🗑️ To remove a wallet, use this command:\n\n"
-            "`/remove <address>`\n\n"
-            "Example:\n"
-            "`/remove DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK`\n\n"
-            "Or use `/list` to see all addresses.",
-            parse_mode='Markdown'
-        )
 
-    elif query.data == "help":
-        await help_command(update, context, is_callback=True)
-
-    elif query.data == "back_to_menu":
-        keyboard = [
-            [InlineKeyboardButton("➕ Add Wallet", callback_data="add_wallet")],
-            [InlineKeyboardButton("📋 List Wallets", callback_data="list_wallets")],
-            [InlineKeyboardButton("🗑️ Remove Wallet", callback_data="remove_wallet")],
-            [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await query.edit_message_text(
-            "🤖 *MEV Alert Bot*\n\nWhat would you like to do?",
-            reply_markup=reply_markup,
-            parse_mode='Markdown'
-        )
+async def show_add_wallet_usage(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle "Add Wallet" button"""
+    await update.callback_query.edit_message_text(ADD_WALLET_USAGE_TEXT, parse_mode='Markdown')
+
+
+async def show_remove_wallet_usage(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle "Remove Wallet" button"""
+    await update.callback_query.edit_message_text(REMOVE_WALLET_USAGE_TEXT, parse_mode='Markdown')
+
+
+async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle "Back to Menu" button"""
+    await update.callback_query.edit_message_text(
+        MAIN_MENU_TEXT,
+        reply_markup=MAIN_MENU_MARKUP,
+        parse_mode='Markdown'
+    )
 
 
 async def add_wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -278,6 +641,13 @@ async def add_wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     address = context.args[0]
     name = " ".join(context.args[1:])
 
+    # Reject malformed addresses before spawning a monitor and hitting the RPC
+    if not BASE58_ADDRESS_RE.fullmatch(address):
+        await update.message.reply_text(
+            "❌ Invalid Solana address. Addresses are 32-44 base58 characters."
+        )
+        return
+
     # Check if already tracking
     if address in tracked_wallets:
         await update.message.reply_text(f"⚠ Already tracking wallet: {tracked_wallets[address]}")
@@ -288,10 +658,7 @@ async def add_wallet_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     # Start monitoring - pass RPC URL, not checker instance
     chat_id = update.effective_chat.id
-    rpc_url = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
-    poll_interval = float(os.getenv("POLL_INTERVAL", "2.0"))  # Default 2 seconds
-
-    monitor = WalletMonitor(address, name, rpc_url, chat_id, poll_interval)
+    monitor = WalletMonitor(address, name, SOLANA_RPC_URL, chat_id, POLL_INTERVAL, SOLANA_WS_URL)
     task = asyncio.create_task(monitor.start_monitoring())
     monitoring_tasks[address] = task
 
@@ -343,57 +710,60 @@ async def list_wallets_command(update: Update, context: ContextTypes.DEFAULT_TYP
     if not tracked_wallets:
         message = "📋 No wallets being tracked.\n\nUse `/add` to add a wallet."
     else:
-        message = f"📋 *Tracked Wallets* ({len(tracked_wallets)}):\n\n"
+        # Build rows in a list and join once, rather than re-copying the message per row
+        parts = [f"📋 *Tracked Wallets* ({len(tracked_wallets)}):\n\n"]
         for i, (address, name) in enumerate(tracked_wallets.items(), 1):
             status = "🟢 Active" if address in monitoring_tasks else "🔴 Stopped"
-            message += f"{i}. *{name}*\n"
-            message += f"   {status}\n"
-            message += f"   `{address[:16]}...`\n\n"
-
-    keyboard = [[InlineKeyboardButton("⬅️ Back to Menu", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+            parts.append(f"{i}. *{name}*\n   {status}\n   `{address[:16]}...`\n\n")
+        message = "".join(parts)
 
     if is_callback:
         await update.callback_query.edit_message_text(
             message,
-            reply_markup=reply_markup,
+            reply_markup=BACK_TO_MENU_MARKUP,
             parse_mode='Markdown'
         )
     else:
-        await update.message.reply_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await update.message.reply_text(message, reply_markup=BACK_TO_MENU_MARKUP, parse_mode='Markdown')
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE, is_callback: bool = False):
     """Handle /help command"""
-    help_text = (
-        "*MEV Alert Bot - Help*\n\n"
-        "*Commands:*\n"
-        "/start - Show main menu\n"
-        "/add <address> <name> - Add wallet to track\n"
-        "/remove <address> - Remove wallet\n"
-        "/list - List all tracked wallets\n"
-        "/help - Show this help\n\n"
-        "*What does this bot do?*\n"
-        "Monitors Solana wallets and sends you alerts when they make "
-        "transactions WITHOUT MEV protection (Jito).\n\n"
-        "*Why is this useful?*\n"
-        "MEV-protected transactions are more secure and prevent frontrunning. "
-        "If a wallet you're tracking stops using MEV protection, you'll know immediately.\n\n"
-        "*Example:*\n"
-        "`/add DYw8...NSKK TopTrader`"
-    )
-
-    keyboard = [[InlineKeyboardButton("⬅️ Back to Menu", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     if is_callback:
         await update.callback_query.edit_message_text(
-            help_text,
-            reply_markup=reply_markup,
+            HELP_TEXT,
+            reply_markup=BACK_TO_MENU_MARKUP,
             parse_mode='Markdown'
         )
     else:
-        await update.message.reply_text(help_text, reply_markup=reply_markup, parse_mode='Markdown')
+        await update.message.reply_text(HELP_TEXT, reply_markup=BACK_TO_MENU_MARKUP, parse_mode='Markdown')
+
+
+# Command name -> handler, all registered through a single CommandHandler
+COMMAND_HANDLERS = {
+    "start": start_command,
+    "add": add_wallet_command,
+    "remove": remove_wallet_command,
+    "list": list_wallets_command,
+    "help": help_command,
+}
+
+
+async def dispatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Route a command to its handler ("/add@MyBot addr name" -> "add")"""
+    command = update.effective_message.text.split(maxsplit=1)[0][1:]
+    name = command.split("@", 1)[0].lower()
+    await COMMAND_HANDLERS[name](update, context)
+
+
+# Button callback_data -> handler, looked up once per press
+BUTTON_HANDLERS = {
+    "add_wallet": show_add_wallet_usage,
+    "list_wallets": partial(list_wallets_command, is_callback=True),
+    "remove_wallet": show_remove_wallet_usage,
+    "help": partial(help_command, is_callback=True),
+    "back_to_menu": show_main_menu,
+}
 
 
 def main():
@@ -406,42 +776,60 @@ def main():
         print("❌ TELEGRAM_BOT_TOKEN not found in .env file!")
         return
 
-    rpc_url = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
-    poll_interval = float(os.getenv("POLL_INTERVAL", "2.0"))
-
     print("🤖 MEV Alert Bot Starting...")
-    print(f"📡 Solana RPC: {rpc_url}")
-    print(f"⏱️  Poll Interval: {poll_interval}s")
+    print(f"📡 Solana RPC: {SOLANA_RPC_URL}")
+    print(f"⏱️  Poll Interval: {POLL_INTERVAL}s")
+    if SOLANA_WS_URL:
+        print(f"📡 Solana WebSocket: {SOLANA_WS_URL} (push mode, polling as fallback)")
 
     # Warn about public RPC limits
-    if "api.mainnet-beta.solana.com" in rpc_url:
+    if "api.mainnet-beta.solana.com" in SOLANA_RPC_URL:
         print("\n⚠️  WARNING: Using public RPC endpoint with strict rate limits")
         print("   For production use, consider using a dedicated RPC provider:")
         print("   - Helius (https://helius.dev)")
         print("   - QuickNode (https://quicknode.com)")
         print("   - Alchemy (https://alchemy.com)")
         print("   Set SOLANA_RPC_URL in your .env file")
-        if poll_interval < 2.0:
-            print(f"   ⚠️  Poll interval ({poll_interval}s) may cause rate limiting with public RPC")
+        if POLL_INTERVAL < 2.0:
+            print(f"   ⚠️  Poll interval ({POLL_INTERVAL}s) may cause rate limiting with public RPC")
         print()
 
     # Create application
-    bot_application = Application.builder().token(token).build()
+    # Concurrent updates: a slow handler in one chat doesn't hold up other chats
+    bot_application = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(True)
+        .post_stop(stop_alert_sender)  # Bot is still usable here, unlike in post_shutdown
+        .post_shutdown(close_rpc_client)
+        .build()
+    )
 
     # Add handlers
-    bot_application.add_handler(CommandHandler("start", start_command))
-    bot_application.add_handler(CommandHandler("add", add_wallet_command))
-    bot_application.add_handler(CommandHandler("remove", remove_wallet_command))
-    bot_application.add_handler(CommandHandler("list", list_wallets_command))
-    bot_application.add_handler(CommandHandler("help", help_command))
+    bot_application.add_handler(CommandHandler(list(COMMAND_HANDLERS), dispatch_command))
     bot_application.add_handler(CallbackQueryHandler(button_callback))
 
     # Start bot
     print("✅ Bot started! Send /start to your bot in Telegram.")
     print("Press Ctrl+C to stop\n")
 
-    # run_polling() is synchronous and manages its own event loop
-    bot_application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # run_webhook()/run_polling() are synchronous and manage their own event loop
+    webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL")
+    if webhook_url:
+        # Telegram pushes updates to us - no getUpdates round-trip per batch
+        port = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
+        print(f"🌐 Webhook mode: {webhook_url} (listening on port {port})")
+        bot_application.run_webhook(
+            listen=os.getenv("TELEGRAM_WEBHOOK_LISTEN", "0.0.0.0"),
+            port=port,
+            url_path=urlparse(webhook_url).path.lstrip("/"),
+            webhook_url=webhook_url,
+            secret_token=os.getenv("TELEGRAM_WEBHOOK_SECRET"),
+            allowed_updates=ALLOWED_UPDATES
+        )
+    else:
+        # Long polling: hold each getUpdates open up to 30s instead of re-polling every 10s
+        bot_application.run_polling(allowed_updates=ALLOWED_UPDATES, timeout=30)
 
 
 if __name__ == "__main__":
@@ -6,17 +6,53 @@ Monitors a Solana address to detect if it's using MEV protection services like J
 
 import asyncio
 import sys
+import time
 from datetime import datetime
-from typing import Set, Dict, Optional
-from dataclasses import dataclass
+from typing import Set, Dict, List, Optional
+from dataclasses import dataclass, field
 from enum import Enum
 
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed, Finalized
+from solana.rpc.commitment import Commitment, Confirmed
 from solders.pubkey import Pubkey
 from solders.signature import Signature
 
 
+# Known Jito tip account addresses (built once, shared by every checker)
+JITO_TIP_ACCOUNTS = frozenset((
+    "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5",
+    "HFqU5x63VTqvQss8hp11i4wVV8bD44PvwucfZ2bU7gRe",
+    "Cw8CFyM9FkoMi7K7Crf6HNQqf4uEMzpKw6QNghXLvLkY",
+    "ADaUMid9yfUytqMBgopwjb2DTLSokTSzL1zt6iGPaS49",
+    "DfXygSm4jCyNCybVYYK6DwvWqjKee8pbDmJGcLWNDXjh",
+    "ADuUkR4vqLUMWXxW9gh6D6L8pMSawimctcNZ5pGwDcEt",
+    "DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL",
+    "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT",
+))
+
+
+# Confirmed transactions remembered for de-duplication while monitoring. Only the
+# newest 10-20 signatures are re-fetched each check, so older ones can be dropped
+MAX_TRACKED_TRANSACTIONS = 1000
+
+# Pending transactions not confirmed within this long are dropped. A blockhash
+# expires after ~150 slots (about a minute), so by then the tx will never land
+PENDING_TRANSACTION_TTL = 120.0  # seconds
+
+# Transaction lookups a checker keeps in flight at once, unless given a shared semaphore
+MAX_CONCURRENT_LOOKUPS = 5
+
+# Retries for a rate-limited lookup in the one-time check (backoff 1s, 2s, 4s).
+# The bot's monitors retry whole batches through their own backoff instead
+CHECK_ONCE_RATE_LIMIT_RETRIES = 3
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an RPC error is an HTTP 429 rate-limit response"""
+    error_str = str(error)
+    return "429" in error_str or "Too Many Requests" in error_str
+
+
 class TransactionStatus(Enum):
     PENDING = "pending"
     CONFIRMED = "confirmed"
@@ -24,13 +60,14 @@ class TransactionStatus(Enum):
     MEV_PROTECTED = "mev_protected"
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionEvent:
     signature: str
     timestamp: datetime
     status: TransactionStatus
     block_time: Optional[int] = None
     slot: Optional[int] = None
+    observed_at: float = field(default_factory=time.monotonic)  # Monotonic seconds, for latency math
 
 
 class MEVProtectionChecker:
@@ -43,8 +80,19 @@ class MEVProtectionChecker:
     - Low latency between submission and confirmation
     """
 
-    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com"):
-        self.client = AsyncClient(rpc_url)
+    __slots__ = (
+        'client', '_owns_client', 'lookup_semaphore', 'monitored_address', 'seen_signatures', 'pending_transactions',
+        'confirmed_transactions', 'last_signature', 'total_transactions',
+        'mev_protected_count', 'public_mempool_count',
+    )
+
+    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com", client: Optional[AsyncClient] = None,
+                 lookup_semaphore: Optional[asyncio.Semaphore] = None):
+        # Pass a shared client to reuse its connection pool across checkers, and the
+        # semaphore that goes with it so lookups stay bounded across all of them
+        self.client = client if client is not None else AsyncClient(rpc_url)
+        self._owns_client = client is None
+        self.lookup_semaphore = lookup_semaphore or asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
         self.monitored_address: Optional[Pubkey] = None
         self.seen_signatures: Set[str] = set()
         self.pending_transactions: Dict[str, TransactionEvent] = {}
@@ -62,8 +110,7 @@ class MEVProtectionChecker:
             version = await self.client.get_version()
             print(f"✓ Connected to Solana RPC")
             # version.value is a RpcVersionInfo object, access as attribute
-            if hasattr(version.value, 'solana_core'):
-                print(f"  Solana version: {version.value.solana_core}")
+            print(f"  Solana version: {version.value.solana_core}")
             return True
         except Exception as e:
             print(f"✗ Failed to connect to RPC: {e}")
@@ -91,6 +138,7 @@ class MEVProtectionChecker:
         transaction statuses to see if they're pending.
         """
         pending_sigs = set()
+        self._expire_pending()
 
         try:
             # Get recent signatures for the address
@@ -145,16 +193,18 @@ class MEVProtectionChecker:
                 if sig_str in self.confirmed_transactions:
                     continue
 
-                # Skip failed transactions
+                # Skip failed transactions (not remembered: check_pending_transactions
+                # already ignores them, so they'd only grow seen_signatures unbounded)
                 if sig_info.err is not None:
-                    self.seen_signatures.add(sig_str)
+                    self.pending_transactions.pop(sig_str, None)
                     continue
 
                 # New confirmed transaction found
                 self.total_transactions += 1
 
-                # Check if we saw this transaction as pending
-                was_pending = sig_str in self.pending_transactions
+                # Check if we saw this transaction as pending (no longer needed once confirmed)
+                pending_event = self.pending_transactions.pop(sig_str, None)
+                was_pending = pending_event is not None
 
                 event = TransactionEvent(
                     signature=sig_str,
@@ -164,13 +214,11 @@ class MEVProtectionChecker:
                     slot=sig_info.slot
                 )
 
-                self.confirmed_transactions[sig_str] = event
-                self.seen_signatures.add(sig_str)
+                self._record_confirmed(event)
 
                 if was_pending:
                     self.public_mempool_count += 1
-                    pending_event = self.pending_transactions[sig_str]
-                    latency = (event.timestamp - pending_event.timestamp).total_seconds()
+                    latency = event.observed_at - pending_event.observed_at
                     print(f"\n  ✓ PUBLIC MEMPOOL transaction detected:")
                     print(f"    Signature: {sig_str}")
                     print(f"    Slot: {sig_info.slot}")
@@ -192,6 +240,26 @@ class MEVProtectionChecker:
         except Exception as e:
             print(f"  ⚠ Error checking confirmed transactions: {e}")
 
+    def _record_confirmed(self, event: TransactionEvent):
+        """Remember a confirmed transaction, evicting the oldest beyond MAX_TRACKED_TRANSACTIONS"""
+        self.confirmed_transactions[event.signature] = event
+        self.seen_signatures.add(event.signature)
+
+        if len(self.confirmed_transactions) > MAX_TRACKED_TRANSACTIONS:
+            oldest = next(iter(self.confirmed_transactions))
+            del self.confirmed_transactions[oldest]
+            self.seen_signatures.discard(oldest)
+
+    def _expire_pending(self):
+        """Drop pending transactions older than PENDING_TRANSACTION_TTL"""
+        # Insertion order is observation order, so expired entries are at the front
+        cutoff = time.monotonic() - PENDING_TRANSACTION_TTL
+        while self.pending_transactions:
+            oldest = next(iter(self.pending_transactions.values()))
+            if oldest.observed_at >= cutoff:
+                break
+            del self.pending_transactions[oldest.signature]
+
     def _print_statistics(self):
         """Print current statistics"""
         if self.total_transactions == 0:
@@ -243,27 +311,35 @@ class MEVProtectionChecker:
 
             print(f"\n  Found {len(response.value)} transactions. Analyzing...\n")
 
-            for sig_info in response.value:
-                sig_str = str(sig_info.signature)
-
-                # Skip failed transactions
-                if sig_info.err is not None:
-                    continue
-
-                # Skip already processed
-                if sig_str in self.confirmed_transactions:
-                    continue
+            # Skip failed and already processed transactions
+            new_sigs = [
+                sig_info for sig_info in response.value
+                if sig_info.err is None and str(sig_info.signature) not in self.confirmed_transactions
+            ]
+
+            # Since we're checking historical data, we can't know if they were
+            # pending, so we use heuristics: very fast confirmation suggests MEV
+            # For simplicity, consider all as MEV protected in one-time check
+            # A better heuristic: check transaction details for Jito tip accounts
+
+            # Check if transactions use Jito (has tip to Jito addresses), fetching concurrently
+            try:
+                jito_results = await self.check_jito_transactions(
+                    [str(sig_info.signature) for sig_info in new_sigs],
+                    commitment=Confirmed,
+                    rate_limit_retries=CHECK_ONCE_RATE_LIMIT_RETRIES
+                )
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                print(f"\n  ⚠ Still rate limited after {CHECK_ONCE_RATE_LIMIT_RETRIES} retries: analysis incomplete")
+                print("    Try again later or use a private RPC endpoint")
+                return
 
+            for sig_info, is_jito in zip(new_sigs, jito_results):
+                sig_str = str(sig_info.signature)
                 self.total_transactions += 1
 
-                # Since we're checking historical data, we can't know if they were
-                # pending, so we use heuristics: very fast confirmation suggests MEV
-                # For simplicity, consider all as MEV protected in one-time check
-                # A better heuristic: check transaction details for Jito tip accounts
-
-                # Check if transaction uses Jito (has tip to Jito addresses)
-                is_jito = await self._check_if_jito_transaction(sig_str)
-
                 if is_jito:
                     self.mev_protected_count += 1
                     status = TransactionStatus.MEV_PROTECTED
@@ -281,8 +357,7 @@ class MEVProtectionChecker:
                     slot=sig_info.slot
                 )
 
-                self.confirmed_transactions[sig_str] = event
-                self.seen_signatures.add(sig_str)
+                self._record_confirmed(event)
 
             # Print final statistics
             print("\n" + "=" * 70)
@@ -292,53 +367,59 @@ class MEVProtectionChecker:
             print(f"\n✗ Error during analysis: {e}")
             raise
 
-    async def _check_if_jito_transaction(self, signature: str) -> bool:
+    async def check_jito_transactions(self, signatures: List[str], commitment: Optional[Commitment] = None,
+                                      rate_limit_retries: int = 0) -> List[bool]:
         """
-        Check if a transaction was sent through Jito by looking for Jito tip accounts.
-
-        Known Jito tip accounts:
-        - 96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5
-        - HFqU5x63VTqvQss8hp11i4wVV8bD44PvwucfZ2bU7gRe
-        - Cw8CFyM9FkoMi7K7Crf6HNQqf4uEMzpKw6QNghXLvLkY
-        - ADaUMid9yfUytqMBgopwjb2DTLSokTSzL1zt6iGPaS49
-        - DfXygSm4jCyNCybVYYK6DwvWqjKee8pbDmJGcLWNDXjh
-        - ADuUkR4vqLUMWXxW9gh6D6L8pMSawimctcNZ5pGwDcEt
-        - DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL
-        - 3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT
+        Check several transactions for Jito tips concurrently.
+
+        Lookups run in parallel, bounded by lookup_semaphore (shared by every checker
+        on the same client) so bursts stay within RPC rate limits. Results are
+        returned in the same order as `signatures`. A rate-limit error is raised
+        rather than reported as "not Jito".
+
+        Pass the commitment the signatures were listed at: the client default is
+        Finalized, so a just-confirmed transaction would not be found otherwise.
+        With rate_limit_retries, each rate-limited lookup is retried that many times
+        with exponential backoff before the error is raised.
+        """
+        async def check_one(signature: str) -> bool:
+            for attempt in range(rate_limit_retries + 1):
+                try:
+                    async with self.lookup_semaphore:
+                        return await self._check_if_jito_transaction(signature, commitment)
+                except Exception as e:
+                    if attempt == rate_limit_retries or not is_rate_limit_error(e):
+                        raise
+                # Back off outside the semaphore so other lookups can proceed
+                await asyncio.sleep(2 ** attempt)
+
+        return list(await asyncio.gather(*(check_one(sig) for sig in signatures)))
+
+    async def _check_if_jito_transaction(self, signature: str, commitment: Optional[Commitment] = None) -> bool:
+        """
+        Check if a transaction was sent through Jito by looking for Jito tip accounts
+        (see JITO_TIP_ACCOUNTS).
         """
         try:
             # Get transaction details
             tx_response = await self.client.get_transaction(
                 Signature.from_string(signature),
+                commitment=commitment,
                 max_supported_transaction_version=0
             )
 
             if not tx_response.value:
                 return False
 
-            # Jito tip account addresses
-            jito_tip_accounts = {
-                "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5",
-                "HFqU5x63VTqvQss8hp11i4wVV8bD44PvwucfZ2bU7gRe",
-                "Cw8CFyM9FkoMi7K7Crf6HNQqf4uEMzpKw6QNghXLvLkY",
-                "ADaUMid9yfUytqMBgopwjb2DTLSokTSzL1zt6iGPaS49",
-                "DfXygSm4jCyNCybVYYK6DwvWqjKee8pbDmJGcLWNDXjh",
-                "ADuUkR4vqLUMWXxW9gh6D6L8pMSawimctcNZ5pGwDcEt",
-                "DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL",
-                "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT",
-            }
-
             # Check account keys in the transaction
-            if hasattr(tx_response.value.transaction, 'message'):
-                message = tx_response.value.transaction.message
-                if hasattr(message, 'account_keys'):
-                    for account in message.account_keys:
-                        if str(account) in jito_tip_accounts:
-                            return True
+            # (value.transaction is the tx-with-meta wrapper; the message is one level down)
+            account_keys = tx_response.value.transaction.transaction.message.account_keys
+            return not JITO_TIP_ACCOUNTS.isdisjoint(str(account) for account in account_keys)
 
-            return False
-
-        except Exception:
+        except Exception as e:
+            # Being rate limited says nothing about the transaction; let the caller back off
+            if is_rate_limit_error(e):
+                raise
             # If we can't fetch transaction details, assume not Jito
             return False
 
@@ -365,10 +446,10 @@ class MEVProtectionChecker:
         try:
             while True:
                 check_count += 1
-                timestamp = datetime.now().strftime("%H:%M:%S")
 
-                # Print periodic status
+                # Print periodic status (timestamp only formatted when actually printed)
                 if check_count % 10 == 0:
+                    timestamp = time.strftime("%H:%M:%S")
                     print(f"[{timestamp}] Monitoring... (checked {check_count} times)")
 
                 # Check for pending transactions (mempool visibility)
@@ -425,8 +506,9 @@ class MEVProtectionChecker:
         print("=" * 70)
 
     async def close(self):
-        """Close the RPC connection"""
-        await self.client.close()
+        """Close the RPC connection (a shared client is left open for its owner)"""
+        if self._owns_client:
+            await self.client.close()
 
 
 async def main():